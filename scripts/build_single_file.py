@@ -35,6 +35,7 @@ invocation in a subprocess.
 from __future__ import annotations
 
 import ast
+import os
 import re
 import subprocess
 import sys
@@ -343,8 +344,13 @@ def build_executable(
 
     # bin/ is gitignored, so a fresh checkout has no bin/ directory at all
     output_file.parent.mkdir(parents=True, exist_ok=True)
-    output_file.write_text(output_content)
-    output_file.chmod(0o755)
+    # Write beside the target and rename over it: parallel test workers
+    # may rebuild at the same time, and none of them may ever execute a
+    # half-written script
+    tmp_file = output_file.with_name(f".{output_file.name}.{os.getpid()}.tmp")
+    tmp_file.write_text(output_content)
+    tmp_file.chmod(0o755)
+    os.replace(tmp_file, output_file)
 
     # ... and actually run: a build defect that only manifests at runtime
     # (a mangled import, a name collision between concatenated modules)
@@ -74,6 +74,9 @@ from stow_python.util import (
     get_debug_level,
     set_debug_level,
     join_paths,
+    child_path,
+    path_prefixes,
+    sorted_names,
     parent,
     canon_path,
     adjust_dotfile,
@@ -95,6 +98,9 @@ _SELF_IGNORE_PATTERN = "^/" + re.escape(LOCAL_IGNORE_FILE) + "$"
 # non-ASCII whitespace such as U+00A0 and ignore files Perl stows
 _ASCII_WHITESPACE = " \t\n\r\f\v"
 
+# Perl: s/\s+#.+//, a trailing comment after whitespace
+_TRAILING_COMMENT_RE = re.compile(f"[{_ASCII_WHITESPACE}]+#.+")
+
 
 # =============================================================================
 # Public API
@@ -209,6 +215,17 @@ def _compile_option_pattern(pattern: str, option: str) -> re.Pattern[str]:
             f"(anchoring is applied automatically), "
             f"not {type(pattern).__name__}"
         )
+    return _compile_anchored_pattern(pattern, option)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_anchored_pattern(pattern: str, option: str) -> re.Pattern[str]:
+    """Compile a type-checked option pattern, shared across stowers.
+
+    Compiled patterns are immutable, so repeated library calls with the
+    same options reuse them. A malformed pattern raises, and lru_cache
+    does not cache exceptions.
+    """
     if POSIX_CLASS_RE.search(pattern):
         raise StowError(f"Failed to compile regexp for --{option}: {POSIX_CLASS_HINT}")
     body, flags = hoist_leading_flags(pattern)
@@ -218,6 +235,55 @@ def _compile_option_pattern(pattern: str, option: str) -> re.Pattern[str]:
         raise StowError(f"Failed to compile regexp for --{option}: {e}") from e
 
 
+# Constructs that refer to a group by number or name. Merging renumbers
+# groups, so a pattern containing any of these is never merged. Over-broad
+# on purpose (an escaped backslash before a digit also matches): a false
+# hit only costs the merge.
+_GROUP_REFERENCE_RE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+
+
+def _combine_option_patterns(
+    patterns: Sequence[re.Pattern[str]],
+) -> re.Pattern[str] | None:
+    """Fold several compiled option patterns into one alternation.
+
+    search() on the result matches exactly when one of the patterns does,
+    in a single pass of the regex engine. Only done when all patterns
+    share their flags and none refers back to a group, since the merge
+    renumbers groups; otherwise, and for fewer than two patterns, returns
+    None and callers loop as before.
+    """
+    if len(patterns) < 2:
+        return None
+    flags = patterns[0].flags
+    if any(p.flags != flags or _GROUP_REFERENCE_RE.search(p.pattern) for p in patterns):
+        return None
+    try:
+        return compile_user_regexp("|".join(p.pattern for p in patterns), flags)
+    except re.error:
+        return None
+
+
+# Action.CREATE is a lookup on the enum class every time it is evaluated,
+# several times slower than reading a module global. The planned-state
+# probes compare actions for every node they check, so comparisons use
+# these aliases, and by identity: enum members are singletons.
+_CREATE = Action.CREATE
+_REMOVE = Action.REMOVE
+
+
+# What a newly planned task does to an already planned task of the same
+# kind (link or directory) at the same path: the same action again is a
+# no-op, the opposite action cancels the planned one. The values are the
+# verbs of the "(... previous action)" debug lines.
+_PLANNED_OUTCOME = {
+    (Action.CREATE, Action.CREATE): "duplicates",
+    (Action.REMOVE, Action.REMOVE): "duplicates",
+    (Action.CREATE, Action.REMOVE): "reverts",
+    (Action.REMOVE, Action.CREATE): "reverts",
+}
+
+
 # =============================================================================
 # Internal Stower class
 # =============================================================================
@@ -234,14 +300,21 @@ class _Stower:
     def __init__(self, config: StowConfig):
         self.c = config
 
-        # Compile the user-supplied patterns (see _compile_option_pattern)
-        self._ignore_pats = [
+        # Compile the user-supplied patterns (see _compile_option_pattern);
+        # tuples, like the config fields they come from, as they never change
+        self._ignore_pats = tuple(
             _compile_option_pattern(p, "ignore") for p in config.ignore
-        ]
-        self._defer_pats = [_compile_option_pattern(p, "defer") for p in config.defer]
-        self._override_pats = [
+        )
+        self._defer_pats = tuple(
+            _compile_option_pattern(p, "defer") for p in config.defer
+        )
+        self._override_pats = tuple(
             _compile_option_pattern(p, "override") for p in config.override
-        ]
+        )
+        # Single-pass "does any of them match?" checks, where possible
+        self._ignore_any = _combine_option_patterns(self._ignore_pats)
+        self._defer_any = _combine_option_patterns(self._defer_pats)
+        self._override_any = _combine_option_patterns(self._override_pats)
 
         # Per-stower cache of parsed .stow-local-ignore/.stow-global-ignore
         # files, keyed by the path used to read them. The paths are relative
@@ -265,8 +338,20 @@ class _Stower:
         # State
         self.conflicts: dict[str, list[str]] = {}
         self.tasks: list[Task] = []
+        # Bound once: every _do_* planner appends through it. The list is
+        # only ever modified in place, so the binding never goes stale.
+        self._append_task = self.tasks.append
+        # Two indexes, as in Perl, not one keyed by path: a str caches its
+        # hash, so probing both costs a second table probe, not a rehash
         self.dir_task_for: dict[str, DirTask] = {}
         self.link_task_for: dict[str, LinkTask] = {}
+        # The paths in link_task_for whose task is a REMOVE, kept in step
+        # by _do_unlink and _do_link. Stow runs plan none, which lets
+        # _is_parent_link_scheduled_for_removal skip its prefix walk.
+        self._link_removals: set[str] = set()
+        # How many tasks _settle_planned_task has marked skipped: most
+        # runs revert nothing, and process_tasks then keeps the list as is
+        self._skipped_count = 0
 
     @contextmanager
     def _session(self) -> Iterator[None]:
@@ -364,12 +449,14 @@ class _Stower:
         )
 
     def process_tasks(self) -> None:
-        """Process each task in the tasks list."""
+        """Run tasks serially in planning order; the first failure stops execution."""
         with self._session():
             debug(2, 0, "Processing tasks...")
 
-            # Strip out all tasks with a skip action
-            self.tasks = [t for t in self.tasks if not t.skipped]
+            # Strip out all tasks with a skip action (in place, see __init__)
+            if self._skipped_count:
+                self.tasks[:] = [t for t in self.tasks if not t.skipped]
+                self._skipped_count = 0
 
             if not self.tasks:
                 return
@@ -429,19 +516,22 @@ class _Stower:
         if self._should_skip_target(pkg_subdir):
             return
 
+        # getcwd() runs even when the message is not printed: Perl makes
+        # the call unconditionally, and the syscall trace must match
         cwd = os.getcwd()
-        msg = f"Stowing contents of {stow_path} / {package} / {pkg_subdir} (cwd={cwd})"
+        if get_debug_level() >= 3:
+            msg = f"Stowing contents of {stow_path} / {package} / {pkg_subdir} (cwd={cwd})"
 
-        # Replace $HOME with ~ for readability. Like Perl's
-        # s!$ENV{HOME}(/|$)!~$1!g: only before a slash or at the end of the
-        # message, so e.g. a "(cwd=$HOME)" suffix stays untouched and a
-        # sibling path like ${HOME}2 is never mangled to ~2.
-        home = os.environ.get("HOME", "")
-        if home:
-            msg = re.sub(re.escape(home) + r"(/|$)", r"~\1", msg)
+            # Replace $HOME with ~ for readability. Like Perl's
+            # s!$ENV{HOME}(/|$)!~$1!g: only before a slash or at the end of
+            # the message, so e.g. a "(cwd=$HOME)" suffix stays untouched
+            # and a sibling path like ${HOME}2 is never mangled to ~2.
+            home = os.environ.get("HOME", "")
+            if home:
+                msg = re.sub(re.escape(home) + r"(/|$)", r"~\1", msg)
 
-        debug(3, 0, msg)
-        debug(4, 1, f"target subdir is {target_subdir}")
+            debug(3, 0, msg)
+            debug(4, 1, f"target subdir is {target_subdir}")
 
         pkg_path_from_cwd = join_paths(stow_path, package, pkg_subdir)
 
@@ -457,11 +547,8 @@ class _Stower:
                 f"cannot read directory: {pkg_path_from_cwd} ({e.strerror})", errno=2
             ) from e
 
-        # Pushed in reverse so that popping visits entries in sorted order.
-        # os.fsencode as the key sorts by raw bytes, which is what Perl's
-        # sort does: a name that is not valid UTF-8 would otherwise be
-        # visited at a different point in the listing.
-        for node in sorted(listing, key=os.fsencode, reverse=True):
+        # Pushed in reverse so that popping visits entries in sorted order
+        for node in sorted_names(listing, reverse=True):
             jobs.append(
                 StowNodeJob(stow_path, package, pkg_subdir, target_subdir, node)
             )
@@ -479,9 +566,9 @@ class _Stower:
         if node in (".", ".."):
             return
 
-        package_node_path = join_paths(pkg_subdir, node)
+        package_node_path = child_path(pkg_subdir, node)
         target_node = node
-        target_node_path = join_paths(target_subdir, target_node)
+        target_node_path = child_path(target_subdir, target_node)
 
         if self._should_ignore(stow_path, package, target_node_path):
             return
@@ -491,7 +578,7 @@ class _Stower:
             if adjusted != node:
                 debug(4, 1, f"Adjusting: {node} => {adjusted}")
                 target_node = adjusted
-                target_node_path = join_paths(target_subdir, target_node)
+                target_node_path = child_path(target_subdir, target_node)
 
         self._stow_node(stow_path, package, package_node_path, target_node_path, jobs)
 
@@ -504,7 +591,9 @@ class _Stower:
         jobs: list[StowJob],
     ) -> None:
         """Stow the given node, queueing subdirectory scans onto the job stack."""
-        debug(3, 0, f"Stowing entry {stow_path} / {package} / {pkg_subpath}")
+        verbosity = get_debug_level()
+        if verbosity >= 3:
+            debug(3, 0, f"Stowing entry {stow_path} / {package} / {pkg_subpath}")
 
         # Calculate the path to the package directory or sub-directory
         # whose contents need to be stowed, relative to the current
@@ -524,12 +613,20 @@ class _Stower:
 
         # How many directories deep are we?
         level = pkg_subpath.count("/")
-        debug(2, 1, f"level of {pkg_subpath} is {level}")
+        if verbosity >= 2:
+            debug(2, 1, f"level of {pkg_subpath} is {level}")
 
         # Calculate the destination of the symlink which would need to be
         # installed within this directory in the absence of folding.
-        link_dest = join_paths("../" * level, pkg_path_from_cwd)
-        debug(4, 1, f"link destination {link_dest}")
+        # pkg_path_from_cwd is relative and already normalized by
+        # join_paths(), and prefixing it with ".." components keeps it so;
+        # the join only matters for its -v5 trace.
+        if verbosity >= 5:
+            link_dest = join_paths("../" * level, pkg_path_from_cwd)
+        else:
+            link_dest = "../" * level + pkg_path_from_cwd
+        if verbosity >= 4:
+            debug(4, 1, f"link destination {link_dest}")
 
         # Does the target already exist?
         if self._is_a_link(target_subpath):
@@ -579,6 +676,9 @@ class _Stower:
 
         # Does the existing target_subpath actually point to anything?
         if self._is_a_node(stowed.path):
+            # A textual comparison, as in Perl: a link spelled differently
+            # but resolving to the same place is not "already stowed", and
+            # an inode check would add stat() calls Perl never makes
             if existing_link_dest == link_dest:
                 debug(
                     2,
@@ -699,16 +799,18 @@ class _Stower:
         if self._should_skip_target(target_subdir):
             return
 
+        # Unconditional for the syscall trace, as in _stow_scan_dir
         cwd = os.getcwd()
-        compat_str = ", compat" if self.c.compat else ""
-        msg = f"Unstowing contents of {self.stow_path} / {package} / {pkg_subdir} (cwd={cwd}{compat_str})"
+        if get_debug_level() >= 3:
+            compat_str = ", compat" if self.c.compat else ""
+            msg = f"Unstowing contents of {self.stow_path} / {package} / {pkg_subdir} (cwd={cwd}{compat_str})"
 
-        home = os.environ.get("HOME")
-        if home:
-            msg = msg.replace(home + "/", "~/")
+            home = os.environ.get("HOME")
+            if home:
+                msg = msg.replace(home + "/", "~/")
 
-        debug(3, 0, msg)
-        debug(4, 1, f"target subdir is {target_subdir}")
+            debug(3, 0, msg)
+            debug(4, 1, f"target subdir is {target_subdir}")
 
         # Calculate the path to the package directory or sub-directory
         # whose contents need to be unstowed, relative to the current
@@ -751,7 +853,7 @@ class _Stower:
         if not self.c.compat:
             jobs.append(CleanupJob(target_subdir))
         # Pushed in reverse so that popping visits entries in sorted order
-        for node in sorted(listing, key=os.fsencode, reverse=True):
+        for node in sorted_names(listing, reverse=True):
             jobs.append(UnstowNodeJob(package, pkg_subdir, target_subdir, node))
 
     def _unstow_visit_node(
@@ -768,7 +870,7 @@ class _Stower:
 
         package_node = node
         target_node = node
-        target_node_path = join_paths(target_subdir, target_node)
+        target_node_path = child_path(target_subdir, target_node)
 
         if self._should_ignore(self.stow_path, package, target_node_path):
             return
@@ -784,17 +886,20 @@ class _Stower:
                 if adjusted != node:
                     debug(4, 1, f"Adjusting: {node} => {adjusted}")
                     target_node = adjusted
-                    target_node_path = join_paths(target_subdir, target_node)
+                    target_node_path = child_path(target_subdir, target_node)
 
-        package_node_path = join_paths(pkg_subdir, package_node)
+        package_node_path = child_path(pkg_subdir, package_node)
         self._unstow_node(package, package_node_path, target_node_path, jobs)
 
     def _unstow_node(
         self, package: str, pkg_subpath: str, target_subpath: str, jobs: list[UnstowJob]
     ) -> None:
         """Unstow the given node, queueing subdirectory scans onto the job stack."""
-        debug(3, 0, f"Unstowing entry from target: {target_subpath}")
-        debug(4, 1, f"Package entry: {self.stow_path} / {package} / {pkg_subpath}")
+        verbosity = get_debug_level()
+        if verbosity >= 3:
+            debug(3, 0, f"Unstowing entry from target: {target_subpath}")
+        if verbosity >= 4:
+            debug(4, 1, f"Package entry: {self.stow_path} / {package} / {pkg_subpath}")
 
         # Does the target exist?
         if self._is_a_link(target_subpath):
@@ -862,7 +967,9 @@ class _Stower:
     def _cleanup_invalid_links(self, dir_path: str) -> None:
         """Clean up orphaned links that may block folding."""
         cwd = os.getcwd()
-        debug(2, 0, f"Cleaning up any invalid links in {dir_path} (pwd={cwd})")
+        verbosity = get_debug_level()
+        if verbosity >= 2:
+            debug(2, 0, f"Cleaning up any invalid links in {dir_path} (pwd={cwd})")
 
         if not os.path.isdir(dir_path):
             raise StowInternalError(
@@ -876,20 +983,21 @@ class _Stower:
                 f"cannot read directory: {dir_path} ({e.strerror})", errno=2
             ) from e
 
-        for node in sorted(listing, key=os.fsencode):
+        for node in sorted_names(listing):
             if node in (".", ".."):
                 continue
 
-            node_path = join_paths(dir_path, node)
+            node_path = child_path(dir_path, node)
 
             if not os.path.islink(node_path):
                 continue
 
-            debug(4, 1, f"Checking validity of link {node_path}")
+            if verbosity >= 4:
+                debug(4, 1, f"Checking validity of link {node_path}")
 
             if node_path in self.link_task_for:
                 task = self.link_task_for[node_path]
-                if task.action != Action.REMOVE:
+                if task.action is not _REMOVE:
                     print(
                         f"Unexpected action {task.action.value} scheduled for {node_path}; skipping clean-up",
                         file=sys.stderr,
@@ -904,25 +1012,28 @@ class _Stower:
                 raise StowError(f"Could not read link {node_path}") from e
 
             target_subpath = join_paths(dir_path, link_dest)
-            debug(4, 2, f"join {dir_path} {link_dest}")
+            if verbosity >= 4:
+                debug(4, 2, f"join {dir_path} {link_dest}")
 
             if os.path.exists(target_subpath):
-                debug(
-                    4,
-                    2,
-                    f"Link target {link_dest} exists at {target_subpath}; skipping clean up",
-                )
+                if verbosity >= 4:
+                    debug(
+                        4,
+                        2,
+                        f"Link target {link_dest} exists at {target_subpath}; skipping clean up",
+                    )
                 continue
-            else:
+            elif verbosity >= 4:
                 debug(
                     4, 2, f"Link target {link_dest} doesn't exist at {target_subpath}"
                 )
 
-            debug(
-                3,
-                1,
-                f"Checking whether valid link {node_path} -> {link_dest} is owned by stow",
-            )
+            if verbosity >= 3:
+                debug(
+                    3,
+                    1,
+                    f"Checking whether valid link {node_path} -> {link_dest} is owned by stow",
+                )
 
             owner = self._get_owning_package(node_path, link_dest)
             if owner:
@@ -939,7 +1050,8 @@ class _Stower:
 
         Returns path to the parent dir iff the tree can be safely folded.
         """
-        debug(3, 2, f"Is {target_subdir} foldable?")
+        if get_debug_level() >= 3:
+            debug(3, 2, f"Is {target_subdir} foldable?")
 
         if self.c.no_folding:
             debug(3, 3, "Not foldable because --no-folding enabled")
@@ -957,11 +1069,11 @@ class _Stower:
 
         parent_in_pkg = None
 
-        for node in sorted(listing, key=os.fsencode):
+        for node in sorted_names(listing):
             if node in (".", ".."):
                 continue
 
-            target_node_path = join_paths(target_subdir, node)
+            target_node_path = child_path(target_subdir, node)
 
             if not self._is_a_node(target_node_path):
                 continue
@@ -1010,10 +1122,11 @@ class _Stower:
                 f'Cannot read directory "{target_subdir}" ({e.strerror})\n'
             ) from e
 
-        for node in sorted(listing, key=os.fsencode):
+        for node in sorted_names(listing):
             if node in (".", ".."):
                 continue
-            node_path = join_paths(target_subdir, node)
+            node_path = child_path(target_subdir, node)
+            # _is_a_node, not d_type: it must see tasks planned in this run
             if self._is_a_node(node_path):
                 self._do_unlink(node_path)
 
@@ -1023,7 +1136,7 @@ class _Stower:
     def _process_task(self, task: Task) -> None:
         """Process a single task."""
         if isinstance(task, DirTask):
-            if task.action == Action.CREATE:
+            if task.action is _CREATE:
                 try:
                     os.mkdir(task.path, 0o777)
                 except OSError as e:
@@ -1039,7 +1152,7 @@ class _Stower:
                     ) from e
 
         elif isinstance(task, LinkTask):
-            if task.action == Action.CREATE:
+            if task.action is _CREATE:
                 try:
                     os.symlink(task.source, task.path)
                 except OSError as e:
@@ -1063,7 +1176,11 @@ class _Stower:
                 ) from e
 
     def _record_conflict(self, package: str, message: str) -> None:
-        """Handle conflicts in stow operations."""
+        """Handle conflicts in stow operations.
+
+        Stored straight into the package -> messages mapping that the CLI
+        and StowResult expose: one setdefault per conflict, and no dict is
+        built in a conflict-free run."""
         debug(2, 0, f"CONFLICT when stowing {package}: {message}")
         self.conflicts.setdefault(package, []).append(message)
 
@@ -1072,31 +1189,43 @@ class _Stower:
         if not target:
             raise StowInternalError("Stow.ignore() called with empty target")
 
-        for suffix in self._ignore_pats:
-            if suffix.search(target):
-                debug(4, 1, f"Ignoring path {target} due to --ignore={suffix.pattern}")
-                return True
+        # The loop still runs on a hit, to name the matching pattern
+        if self._ignore_any is None or self._ignore_any.search(target):
+            for suffix in self._ignore_pats:
+                if suffix.search(target):
+                    debug(
+                        4, 1, f"Ignoring path {target} due to --ignore={suffix.pattern}"
+                    )
+                    return True
 
-        package_dir = join_paths(stow_path, package)
+        # The CLI rejects slashes in package names but the library does not,
+        # so only a plain name takes child_path's shortcut
+        if "/" in package or package in ("", ".", ".."):
+            package_dir = join_paths(stow_path, package)
+        else:
+            package_dir = child_path(stow_path, package)
         patterns = self._get_ignore_regexps(package_dir)
 
-        if patterns.default_regexp is not None:
-            debug(
-                5,
-                2,
-                f"Ignore list regexp for paths:    /{patterns.default_regexp.pattern}/",
-            )
-        else:
-            debug(5, 2, "Ignore list regexp for paths:    none")
+        # The combined regexps are long: format them only for the -v5 trace
+        trace = get_debug_level() >= 5
+        if trace:
+            if patterns.default_regexp is not None:
+                debug(
+                    5,
+                    2,
+                    f"Ignore list regexp for paths:    /{patterns.default_regexp.pattern}/",
+                )
+            else:
+                debug(5, 2, "Ignore list regexp for paths:    none")
 
-        if patterns.local_regexp is not None:
-            debug(
-                5,
-                2,
-                f"Ignore list regexp for segments: /{patterns.local_regexp.pattern}/",
-            )
-        else:
-            debug(5, 2, "Ignore list regexp for segments: none")
+            if patterns.local_regexp is not None:
+                debug(
+                    5,
+                    2,
+                    f"Ignore list regexp for segments: /{patterns.local_regexp.pattern}/",
+                )
+            else:
+                debug(5, 2, "Ignore list regexp for segments: none")
 
         if patterns.default_regexp is not None and patterns.default_regexp.search(
             "/" + target
@@ -1104,25 +1233,31 @@ class _Stower:
             debug(4, 1, f"Ignoring path /{target}")
             return True
 
-        basename = os.path.basename(target)
+        # os.path.basename, minus its fspath and separator lookups
+        basename = target[target.rfind("/") + 1 :]
         if patterns.local_regexp is not None and patterns.local_regexp.search(basename):
             debug(4, 1, f"Ignoring path segment {basename}")
             return True
 
-        debug(5, 1, f"Not ignoring {target}")
+        if trace:
+            debug(5, 1, f"Not ignoring {target}")
         return False
 
     def _get_ignore_regexps(self, dir_path: str) -> IgnorePatterns:
         """Get ignore regexps for the given package directory."""
-        local_stow_ignore = join_paths(dir_path, LOCAL_IGNORE_FILE)
+        # HOME and both candidates are checked on every call, as in Perl, so
+        # a change of HOME takes effect (see the ported ignore tests)
+        local_stow_ignore = child_path(dir_path, LOCAL_IGNORE_FILE)
         home = os.environ.get("HOME", "")
-        global_stow_ignore = join_paths(home, GLOBAL_IGNORE_FILE)
+        global_stow_ignore = child_path(home, GLOBAL_IGNORE_FILE)
 
+        trace = get_debug_level() >= 5
         for file_path in (local_stow_ignore, global_stow_ignore):
             if os.path.exists(file_path):
-                debug(5, 1, f"Using ignore file: {file_path}")
+                if trace:
+                    debug(5, 1, f"Using ignore file: {file_path}")
                 return self._get_ignore_regexps_from_file(file_path)
-            else:
+            elif trace:
                 debug(5, 1, f"{file_path} didn't exist")
 
         debug(4, 1, "Using built-in ignore list")
@@ -1135,11 +1270,15 @@ class _Stower:
         target directory, so a module-wide cache could hand one tree's
         patterns to an operation on another. A failed open is deliberately
         NOT memoized (Perl returns before its memo assignment), so a file
-        that only becomes readable mid-run still takes effect.
+        that only becomes readable mid-run still takes effect. Entries are
+        not revalidated against the file's mtime either: that would take
+        a stat() per lookup that Perl does not make.
         """
-        if file_path in self._ignore_file_cache:
-            debug(4, 2, f"Using memoized regexps from {file_path}")
-            return self._ignore_file_cache[file_path]
+        cached = self._ignore_file_cache.get(file_path)
+        if cached is not None:
+            if get_debug_level() >= 4:
+                debug(4, 2, f"Using memoized regexps from {file_path}")
+            return cached
 
         patterns = _read_ignore_file(file_path)
         if patterns is None:
@@ -1150,10 +1289,14 @@ class _Stower:
 
     def _should_defer(self, path: str) -> bool:
         """Determine if the given path matches a regex in our defer list."""
+        if self._defer_any is not None:
+            return self._defer_any.search(path) is not None
         return any(prefix.search(path) for prefix in self._defer_pats)
 
     def _should_override(self, path: str) -> bool:
         """Determine if the given path matches a regex in our override list."""
+        if self._override_any is not None:
+            return self._override_any.search(path) is not None
         return any(regex.search(path) for regex in self._override_pats)
 
     def _should_skip_target(self, target: str) -> bool:
@@ -1169,7 +1312,7 @@ class _Stower:
             print(f"WARNING: skipping marked Stow directory {target}", file=sys.stderr)
             return True
 
-        if os.path.exists(join_paths(target, ".nonstow")):
+        if os.path.exists(child_path(target, ".nonstow")):
             print(f"WARNING: skipping protected directory {target}", file=sys.stderr)
             return True
 
@@ -1177,8 +1320,11 @@ class _Stower:
         return False
 
     def _is_marked_stow_dir(self, dir_path: str) -> bool:
-        """Check if directory contains .stow marker file."""
-        if os.path.exists(join_paths(dir_path, ".stow")):
+        """Check if directory contains .stow marker file.
+
+        Not memoized; see "Performance and Syscall Parity" in docs/architecture.md.
+        """
+        if os.path.exists(child_path(dir_path, ".stow")):
             debug(5, 5, f"> {dir_path} contained .stow")
             return True
         return False
@@ -1200,17 +1346,23 @@ class _Stower:
         if link_dest.startswith("/"):
             return None
 
-        debug(4, 2, f"find_stowed_path(target={target_subpath}; source={link_dest})")
+        trace = get_debug_level() >= 4
+        if trace:
+            debug(
+                4, 2, f"find_stowed_path(target={target_subpath}; source={link_dest})"
+            )
         pkg_path_from_cwd = join_paths(parent(target_subpath), link_dest)
-        debug(4, 3, f"is symlink destination {pkg_path_from_cwd} owned by stow?")
+        if trace:
+            debug(4, 3, f"is symlink destination {pkg_path_from_cwd} owned by stow?")
 
         pkg_loc = self._parse_link_dest_as_package_subpath(pkg_path_from_cwd)
         if pkg_loc:
-            debug(
-                4,
-                3,
-                f"yes - package {pkg_loc.package} in {self.stow_path} may contain {pkg_loc.subpath}",
-            )
+            if trace:
+                debug(
+                    4,
+                    3,
+                    f"yes - package {pkg_loc.package} in {self.stow_path} may contain {pkg_loc.subpath}",
+                )
             return StowedPath(pkg_path_from_cwd, self.stow_path, pkg_loc.package)
 
         marked = self._find_containing_marked_stow_dir(pkg_path_from_cwd)
@@ -1228,15 +1380,23 @@ class _Stower:
         self, link_dest: str
     ) -> PackageSubpath | None:
         """Detect whether symlink destination is within current stow dir."""
-        debug(4, 4, f"common prefix? link_dest={link_dest}; stow_path={self.stow_path}")
+        trace = get_debug_level() >= 4
+        if trace:
+            debug(
+                4,
+                4,
+                f"common prefix? link_dest={link_dest}; stow_path={self.stow_path}",
+            )
 
         prefix = self.stow_path + "/"
         if not link_dest.startswith(prefix):
-            debug(4, 3, f"no - {link_dest} not under {self.stow_path}")
+            if trace:
+                debug(4, 3, f"no - {link_dest} not under {self.stow_path}")
             return None
 
         remaining = link_dest.removeprefix(prefix)
-        debug(4, 4, f"remaining after removing {self.stow_path}: {remaining}")
+        if trace:
+            debug(4, 4, f"remaining after removing {self.stow_path}: {remaining}")
 
         package, _, subpath = remaining.partition("/")
         return PackageSubpath(package, subpath)
@@ -1245,14 +1405,23 @@ class _Stower:
         self, pkg_path_from_cwd: str
     ) -> MarkedStowDir | None:
         """Detect whether path is within a marked stow directory."""
-        segments = [s for s in pkg_path_from_cwd.split("/") if s]
-
-        for last_segment in range(len(segments)):
+        trace = get_debug_level() >= 5
+        if trace:
             # join_paths (not a plain "/".join) so its verbose-mode debug
             # lines appear here just like in Perl's prefix loop
-            path_so_far = join_paths(*segments[: last_segment + 1])
-            debug(5, 5, f"is {path_so_far} marked stow dir?")
+            segments = [s for s in pkg_path_from_cwd.split("/") if s]
+            prefixes: Iterable[str] = (
+                join_paths(*segments[: i + 1]) for i in range(len(segments))
+            )
+        else:
+            prefixes = path_prefixes(pkg_path_from_cwd)
+
+        for last_segment, path_so_far in enumerate(prefixes):
+            if trace:
+                debug(5, 5, f"is {path_so_far} marked stow dir?")
             if self._is_marked_stow_dir(path_so_far):
+                # Only a hit needs the segment list, for the package name
+                segments = [s for s in pkg_path_from_cwd.split("/") if s]
                 if last_segment == len(segments) - 1:
                     raise StowInternalError(
                         "find_stowed_path() called directly on stow dir"
@@ -1265,46 +1434,55 @@ class _Stower:
 
     def _get_link_task_action(self, path: str) -> Action | None:
         """Finds the link task action for the given path, if there is one."""
-        if path not in self.link_task_for:
-            debug(4, 4, f"| link_task_action({path}): no task")
+        trace = get_debug_level() >= 4
+        task = self.link_task_for.get(path)
+        if task is None:
+            if trace:
+                debug(4, 4, f"| link_task_action({path}): no task")
             return None
-        action = self.link_task_for[path].action
-        debug(
-            4,
-            1,
-            f"link_task_action({path}): link task exists with action {action.value}",
-        )
+        action = task.action
+        if trace:
+            debug(
+                4,
+                1,
+                f"link_task_action({path}): link task exists with action {action.value}",
+            )
         return action
 
     def _get_dir_task_action(self, path: str) -> Action | None:
         """Finds the dir task action for the given path, if there is one."""
-        if path not in self.dir_task_for:
-            debug(4, 4, f"| dir_task_action({path}): no task")
+        trace = get_debug_level() >= 4
+        task = self.dir_task_for.get(path)
+        if task is None:
+            if trace:
+                debug(4, 4, f"| dir_task_action({path}): no task")
             return None
-        action = self.dir_task_for[path].action
-        debug(
-            4,
-            4,
-            f"| dir_task_action({path}): dir task exists with action {action.value}",
-        )
+        action = task.action
+        if trace:
+            debug(
+                4,
+                4,
+                f"| dir_task_action({path}): dir task exists with action {action.value}",
+            )
         return action
 
     def _is_parent_link_scheduled_for_removal(self, target_path: str) -> bool:
         """Determine whether the given path or any parent is a link scheduled for removal."""
-        prefix = ""
-        for part in target_path.split("/"):
-            if not part:
-                continue
-            prefix = join_paths(prefix, part)
-            debug(
-                5,
-                4,
-                f"| parent_link_scheduled_for_removal({target_path}): prefix {prefix}",
-            )
-            if (
-                prefix in self.link_task_for
-                and self.link_task_for[prefix].action == Action.REMOVE
-            ):
+        verbosity = get_debug_level()
+        # The walk is only needed to find a removal, or to trace each prefix
+        if not self._link_removals and verbosity < 5:
+            prefixes: Iterable[str] = ()
+        else:
+            prefixes = path_prefixes(target_path)
+        for prefix in prefixes:
+            if verbosity >= 5:
+                debug(
+                    5,
+                    4,
+                    f"| parent_link_scheduled_for_removal({target_path}): prefix {prefix}",
+                )
+            task = self.link_task_for.get(prefix)
+            if task is not None and task.action is _REMOVE:
                 debug(
                     4,
                     4,
@@ -1312,75 +1490,94 @@ class _Stower:
                 )
                 return True
 
-        debug(
-            4, 4, f"| parent_link_scheduled_for_removal({target_path}): returning false"
-        )
+        if verbosity >= 4:
+            debug(
+                4,
+                4,
+                f"| parent_link_scheduled_for_removal({target_path}): returning false",
+            )
         return False
 
     def _is_a_link(self, target_path: str) -> bool:
         """Determine if the given path is a current or planned link."""
-        debug(4, 2, f"is_a_link({target_path})")
+        trace = get_debug_level() >= 4
+        if trace:
+            debug(4, 2, f"is_a_link({target_path})")
 
         link_action = self._get_link_task_action(target_path)
-        if link_action == Action.REMOVE:
-            debug(4, 2, f"is_a_link({target_path}): returning 0 (remove action found)")
+        if link_action is _REMOVE:
+            if trace:
+                debug(
+                    4, 2, f"is_a_link({target_path}): returning 0 (remove action found)"
+                )
             return False
-        elif link_action == Action.CREATE:
-            debug(4, 2, f"is_a_link({target_path}): returning 1 (create action found)")
+        elif link_action is _CREATE:
+            if trace:
+                debug(
+                    4, 2, f"is_a_link({target_path}): returning 1 (create action found)"
+                )
             return True
 
         if os.path.islink(target_path):
-            debug(4, 2, f"is_a_link({target_path}): is a real link")
+            if trace:
+                debug(4, 2, f"is_a_link({target_path}): is a real link")
             return not self._is_parent_link_scheduled_for_removal(target_path)
 
-        debug(4, 2, f"is_a_link({target_path}): returning 0")
+        if trace:
+            debug(4, 2, f"is_a_link({target_path}): returning 0")
         return False
 
     def _is_a_dir(self, target_path: str) -> bool:
         """Determine if the given path is a current or planned directory."""
-        debug(4, 1, f"is_a_dir({target_path})")
+        trace = get_debug_level() >= 4
+        if trace:
+            debug(4, 1, f"is_a_dir({target_path})")
 
         dir_action = self._get_dir_task_action(target_path)
-        if dir_action == Action.REMOVE:
+        if dir_action is _REMOVE:
             return False
-        elif dir_action == Action.CREATE:
+        elif dir_action is _CREATE:
             return True
 
         if self._is_parent_link_scheduled_for_removal(target_path):
             return False
 
         if os.path.isdir(target_path):
-            debug(4, 1, f"is_a_dir({target_path}): real dir")
+            if trace:
+                debug(4, 1, f"is_a_dir({target_path}): real dir")
             return True
 
-        debug(4, 1, f"is_a_dir({target_path}): returning false")
+        if trace:
+            debug(4, 1, f"is_a_dir({target_path}): returning false")
         return False
 
     def _is_a_node(self, target_path: str) -> bool:
         """Determine whether the given path is a current or planned node."""
-        debug(4, 4, f"| Checking whether {target_path} is a current/planned node")
+        trace = get_debug_level() >= 4
+        if trace:
+            debug(4, 4, f"| Checking whether {target_path} is a current/planned node")
 
         laction = self._get_link_task_action(target_path)
         daction = self._get_dir_task_action(target_path)
 
         # Truth table for link/dir task actions
-        if laction == Action.REMOVE and daction == Action.REMOVE:
+        if laction is _REMOVE and daction is _REMOVE:
             raise StowInternalError(f"removing link and dir: {target_path}")
-        elif laction == Action.REMOVE and daction == Action.CREATE:
+        elif laction is _REMOVE and daction is _CREATE:
             # Unfolding: link removal happens before dir creation.
             return True
-        elif laction == Action.REMOVE and daction is None:
+        elif laction is _REMOVE and daction is None:
             return False
-        elif laction == Action.CREATE and daction == Action.REMOVE:
+        elif laction is _CREATE and daction is _REMOVE:
             # Folding: dir removal happens before link creation.
             return True
-        elif laction == Action.CREATE and daction == Action.CREATE:
+        elif laction is _CREATE and daction is _CREATE:
             raise StowInternalError(f"creating link and dir: {target_path}")
-        elif laction == Action.CREATE:
+        elif laction is _CREATE:
             return True
-        elif laction is None and daction == Action.REMOVE:
+        elif laction is None and daction is _REMOVE:
             return False
-        elif laction is None and daction == Action.CREATE:
+        elif laction is None and daction is _CREATE:
             return True
         # else: laction is None and daction is None - fall through to filesystem check
 
@@ -1388,27 +1585,37 @@ class _Stower:
             return False
 
         if os.path.exists(target_path):
-            debug(4, 3, f"| is_a_node({target_path}): really exists")
+            if trace:
+                debug(4, 3, f"| is_a_node({target_path}): really exists")
             return True
 
-        debug(4, 3, f"| is_a_node({target_path}): returning false")
+        if trace:
+            debug(4, 3, f"| is_a_node({target_path}): returning false")
         return False
 
     def _read_a_link(self, link: str) -> str:
-        """Return the destination of a current or planned link."""
+        """Return the destination of a current or planned link.
+
+        Not memoized; see "Performance and Syscall Parity" in docs/architecture.md.
+        """
+        trace = get_debug_level() >= 4
         action = self._get_link_task_action(link)
         if action:
-            debug(4, 2, f"read_a_link({link}): task exists with action {action.value}")
+            if trace:
+                debug(
+                    4, 2, f"read_a_link({link}): task exists with action {action.value}"
+                )
 
-            if action == Action.CREATE:
+            if action is _CREATE:
                 return self.link_task_for[link].source
-            elif action == Action.REMOVE:
+            elif action is _REMOVE:
                 raise StowInternalError(
                     f"read_a_link() passed a path that is scheduled for removal: {link}"
                 )
 
         elif os.path.islink(link):
-            debug(4, 2, f"read_a_link({link}): is a real link")
+            if trace:
+                debug(4, 2, f"read_a_link({link}): is a real link")
             try:
                 return os.readlink(link)
             except OSError as e:
@@ -1416,42 +1623,59 @@ class _Stower:
 
         raise StowInternalError(f"read_a_link() passed a non-link path: {link}")
 
+    def _settle_planned_task(
+        self,
+        task_for: dict[str, LinkTask] | dict[str, DirTask],
+        planned: LinkTask | DirTask,
+        action: Action,
+        label: str,
+        revert_label: str | None = None,
+    ) -> None:
+        """Fold a new task into an already planned one at the same path.
+
+        _PLANNED_OUTCOME decides whether the new task duplicates the
+        planned one (nothing to do) or reverts it (the planned task is
+        marked skipped and unregistered). label starts the debug line;
+        revert_label replaces it for the revert message where Perl's
+        wording differs.
+        """
+        outcome = _PLANNED_OUTCOME[planned.action, action]
+        if outcome == "reverts":
+            debug(1, 0, f"{revert_label or label} (reverts previous action)")
+            planned.skipped = True
+            self._skipped_count += 1
+            del task_for[planned.path]
+        else:
+            debug(1, 0, f"{label} (duplicates previous action)")
+
     def _do_link(self, link_dest: str, link_src: str) -> None:
         """Wrap 'link' operation for later processing."""
         if link_src in self.dir_task_for:
             dir_task = self.dir_task_for[link_src]
-            if dir_task.action == Action.CREATE:
+            if dir_task.action is _CREATE:
                 raise StowInternalError(
                     f"new link ({link_src} => {link_dest}) clashes with planned new directory"
                 )
             # Action.REMOVE is ok - may need to remove a directory before creating a link
 
-        if link_src in self.link_task_for:
-            link_task = self.link_task_for[link_src]
-
-            if link_task.action == Action.CREATE:
-                if link_task.source != link_dest:
-                    raise StowInternalError(
-                        f"new link clashes with planned new link: {link_task.path} => {link_task.source}"
-                    )
-                else:
-                    debug(
-                        1,
-                        0,
-                        f"LINK: {link_src} => {link_dest} (duplicates previous action)",
-                    )
-                    return
-
-            elif link_task.action == Action.REMOVE:
-                if link_task.source == link_dest:
-                    debug(
-                        1,
-                        0,
-                        f"LINK: {link_src} => {link_dest} (reverts previous action)",
-                    )
-                    link_task.skipped = True
-                    del self.link_task_for[link_src]
-                    return
+        link_task = self.link_task_for.get(link_src)
+        if link_task is not None:
+            # Whether it reverts or replaces a planned removal, a new link
+            # leaves none behind at link_src
+            self._link_removals.discard(link_src)
+            if link_task.source == link_dest:
+                self._settle_planned_task(
+                    self.link_task_for,
+                    link_task,
+                    Action.CREATE,
+                    f"LINK: {link_src} => {link_dest}",
+                )
+                return
+            if link_task.action is _CREATE:
+                raise StowInternalError(
+                    f"new link clashes with planned new link: {link_task.path} => {link_task.source}"
+                )
+            # Removing a link to elsewhere is ok - the new link replaces it
 
         debug(1, 0, f"LINK: {link_src} => {link_dest}")
         task = LinkTask(
@@ -1459,26 +1683,23 @@ class _Stower:
             path=link_src,
             source=link_dest,
         )
-        self.tasks.append(task)
+        self._append_task(task)
         self.link_task_for[link_src] = task
 
     def _do_unlink(self, file_path: str) -> None:
         """Wrap 'unlink' operation for later processing."""
         if file_path in self.link_task_for:
-            link_task = self.link_task_for[file_path]
-
-            if link_task.action == Action.REMOVE:
-                debug(1, 0, f"UNLINK: {file_path} (duplicates previous action)")
-                return
-            elif link_task.action == Action.CREATE:
-                debug(1, 0, f"UNLINK: {file_path} (reverts previous action)")
-                link_task.skipped = True
-                del self.link_task_for[file_path]
-                return
+            self._settle_planned_task(
+                self.link_task_for,
+                self.link_task_for[file_path],
+                Action.REMOVE,
+                f"UNLINK: {file_path}",
+            )
+            return
 
         if (
             file_path in self.dir_task_for
-            and self.dir_task_for[file_path].action == Action.CREATE
+            and self.dir_task_for[file_path].action is _CREATE
         ):
             raise StowInternalError(
                 f"new unlink operation clashes with planned operation: {self.dir_task_for[file_path].action.value} dir {file_path}"
@@ -1496,37 +1717,35 @@ class _Stower:
             path=file_path,
             source=source,
         )
-        self.tasks.append(task)
+        self._append_task(task)
         self.link_task_for[file_path] = task
+        self._link_removals.add(file_path)
 
     def _do_mkdir(self, dir_path: str) -> None:
         """Wrap 'mkdir' operation."""
         if dir_path in self.link_task_for:
             link_task = self.link_task_for[dir_path]
-            if link_task.action == Action.CREATE:
+            if link_task.action is _CREATE:
                 raise StowInternalError(
                     f"new dir clashes with planned new link ({link_task.path} => {link_task.source})"
                 )
             # Action.REMOVE is ok - may need to remove a link before creating a directory
 
         if dir_path in self.dir_task_for:
-            dir_task = self.dir_task_for[dir_path]
-
-            if dir_task.action == Action.CREATE:
-                debug(1, 0, f"MKDIR: {dir_path} (duplicates previous action)")
-                return
-            elif dir_task.action == Action.REMOVE:
-                debug(1, 0, f"MKDIR: {dir_path} (reverts previous action)")
-                dir_task.skipped = True
-                del self.dir_task_for[dir_path]
-                return
+            self._settle_planned_task(
+                self.dir_task_for,
+                self.dir_task_for[dir_path],
+                Action.CREATE,
+                f"MKDIR: {dir_path}",
+            )
+            return
 
         debug(1, 0, f"MKDIR: {dir_path}")
         task = DirTask(
             action=Action.CREATE,
             path=dir_path,
         )
-        self.tasks.append(task)
+        self._append_task(task)
         self.dir_task_for[dir_path] = task
 
     def _do_rmdir(self, dir_path: str) -> None:
@@ -1538,23 +1757,22 @@ class _Stower:
             )
 
         if dir_path in self.dir_task_for:
-            dir_task = self.dir_task_for[dir_path]
-
-            if dir_task.action == Action.REMOVE:
-                debug(1, 0, f"RMDIR {dir_path} (duplicates previous action)")
-                return
-            elif dir_task.action == Action.CREATE:
-                debug(1, 0, f"MKDIR {dir_path} (reverts previous action)")
-                dir_task.skipped = True
-                del self.dir_task_for[dir_path]
-                return
+            # Perl announces the revert as "MKDIR", without the colon
+            self._settle_planned_task(
+                self.dir_task_for,
+                self.dir_task_for[dir_path],
+                Action.REMOVE,
+                f"RMDIR {dir_path}",
+                revert_label=f"MKDIR {dir_path}",
+            )
+            return
 
         debug(1, 0, f"RMDIR {dir_path}")
         task = DirTask(
             action=Action.REMOVE,
             path=dir_path,
         )
-        self.tasks.append(task)
+        self._append_task(task)
         self.dir_task_for[dir_path] = task
 
     def _do_mv(self, src: str, dst: str) -> None:
@@ -1576,7 +1794,7 @@ class _Stower:
             path=src,
             dest=dst,
         )
-        self.tasks.append(task)
+        self._append_task(task)
 
 
 # =============================================================================
@@ -1627,7 +1845,7 @@ def _parse_ignore_lines(lines: Iterable[str]) -> set[str]:
         line = line.strip(_ASCII_WHITESPACE)
         if line.startswith("#") or not line:
             continue
-        line = re.sub(f"[{_ASCII_WHITESPACE}]+#.+", "", line)
+        line = _TRAILING_COMMENT_RE.sub("", line)
         line = line.replace("\\#", "#")
         patterns.add(line)
     return patterns
@@ -1636,6 +1854,11 @@ def _parse_ignore_lines(lines: Iterable[str]) -> set[str]:
 def _compile_ignore_patterns(patterns: set[str]) -> IgnorePatterns:
     """Compile ignore patterns into path and segment regexps.
 
+    Each kind is one alternation, so _should_ignore() makes at most two
+    search() calls per node however long the ignore file is. The two are
+    not merged further: they match different subjects (the whole path vs
+    its basename) and name different reasons in the -v4 output.
+
     The alternations are sorted so the compiled patterns (printed in the
     -v5 debug output) are reproducible across runs; Perl's are randomized
     by hash iteration order (see docs/perl-differences.md #23). Order
@@ -1650,6 +1873,10 @@ def _compile_ignore_patterns(patterns: set[str]) -> IgnorePatterns:
         if POSIX_CLASS_RE.search(pattern):
             raise StowError(f"Failed to compile regexp: {POSIX_CLASS_HINT}")
 
+    # The wrapper groups capture, as in Perl: they take group 1 (1 and 2
+    # for paths) ahead of a user pattern's own groups, which its
+    # backreferences count past, and the -v5 trace prints this exact text.
+    # Non-capturing groups measured no faster in CPython's engine anyway.
     try:
         if segment_patterns:
             combined = "|".join(scope_leading_flags(p) for p in segment_patterns)
@@ -1668,7 +1895,11 @@ def _compile_ignore_patterns(patterns: set[str]) -> IgnorePatterns:
 
 @functools.lru_cache(maxsize=1)
 def _get_default_global_ignore_regexps() -> IgnorePatterns:
-    """Get default global ignore regexps (cached)."""
+    """Get default global ignore regexps.
+
+    Parsed and compiled once per process, on first use: the lru_cache
+    makes every later call a lookup. Kept lazy rather than built at
+    import so runs that find an ignore file never pay for it."""
     default_patterns = """
 # Comments and blank lines are allowed.
 
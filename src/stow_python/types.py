@@ -33,6 +33,7 @@ from __future__ import annotations
 
 import os
 import re
+import sys
 from dataclasses import dataclass
 from enum import Enum
 from typing import Union
@@ -66,13 +67,26 @@ class StowCLIError(StowError):
 
 
 class Action(Enum):
-    """Actions for link/directory tasks."""
+    """Actions for link/directory tasks.
+
+    The values are the words Perl prints in its messages.
+    """
 
     CREATE = "create"
     REMOVE = "remove"
 
 
-@dataclass
+# Options for the records created in bulk (tasks and planner jobs): drop
+# the per-instance __dict__ where the interpreter supports it (dataclass
+# slots need Python 3.10)
+_SLOTTED = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+# A plan holds one task object per filesystem change. Tasks stay whole
+# objects rather than columns of a struct-of-arrays store: StowResult.tasks
+# hands them to callers, and planning revises a planned task through the
+# object that the per-path indexes point at.
+@dataclass(**_SLOTTED)
 class LinkTask:
     """Create or remove a symlink."""
 
@@ -82,7 +96,7 @@ class LinkTask:
     skipped: bool = False
 
 
-@dataclass
+@dataclass(**_SLOTTED)
 class DirTask:
     """Create or remove a directory."""
 
@@ -91,7 +105,7 @@ class DirTask:
     skipped: bool = False
 
 
-@dataclass
+@dataclass(**_SLOTTED)
 class MoveTask:
     """Move a file."""
 
@@ -105,7 +119,12 @@ class MoveTask:
 Task = Union[LinkTask, DirTask, MoveTask]
 
 
-@dataclass(frozen=True)
+# The planner pushes at least one job for every node it visits. Jobs are
+# deliberately mutable but never mutated: they are not declared frozen,
+# because a frozen dataclass sets each field through object.__setattr__,
+# which made job construction several times slower. Treat them as
+# read-only all the same.
+@dataclass(**_SLOTTED)
 class StowScanJob:
     """Planner job: list a package directory and visit its entries."""
 
@@ -115,7 +134,7 @@ class StowScanJob:
     target_subdir: str
 
 
-@dataclass(frozen=True)
+@dataclass(**_SLOTTED)
 class StowNodeJob:
     """Planner job: run per-entry checks and stow one node."""
 
@@ -126,7 +145,7 @@ class StowNodeJob:
     node: str
 
 
-@dataclass(frozen=True)
+@dataclass(**_SLOTTED)
 class UnstowScanJob:
     """Planner job: list a directory and visit its entries for unstowing."""
 
@@ -135,7 +154,7 @@ class UnstowScanJob:
     target_subdir: str
 
 
-@dataclass(frozen=True)
+@dataclass(**_SLOTTED)
 class UnstowNodeJob:
     """Planner job: run per-entry checks and unstow one node."""
 
@@ -145,14 +164,14 @@ class UnstowNodeJob:
     node: str
 
 
-@dataclass(frozen=True)
+@dataclass(**_SLOTTED)
 class FoldJob:
     """Planner job: fold a directory once its subtree has been unstowed."""
 
     target_subdir: str
 
 
-@dataclass(frozen=True)
+@dataclass(**_SLOTTED)
 class CleanupJob:
     """Planner job: clean invalid links after a directory's entries are done."""
 
@@ -31,6 +31,7 @@ including error handling, debugging, and path manipulation.
 
 from __future__ import annotations
 
+from collections.abc import Iterator
 from contextlib import contextmanager
 import errno as errno_module
 import logging
@@ -66,7 +67,9 @@ process_lock = threading.RLock()
 # exact format even for pure library use (Perl's Stow.pm prints the same
 # way), and must never be reformatted by an embedding application's root
 # logger config. Embedders who want the output elsewhere can replace the
-# handlers on logging.getLogger("stow").
+# handlers on logging.getLogger("stow"). That contract is why debug() goes
+# through logging rather than writing to sys.stderr itself; messages above
+# the verbosity never reach the logger, so only printed lines pay for it.
 
 
 class _VerbosityFilter(logging.Filter):
@@ -129,7 +132,13 @@ def debug(level: int, indent: int, msg: str) -> None:
         >= 3: print trace detail: stow/unstow/package/contents/node
         >= 4: debug helper routines
         >= 5: debug ignore lists
+
+    Messages above the current level return before a log record is
+    built; callers on hot paths can also test get_debug_level() first to
+    skip formatting msg at all.
     """
+    if level > _verbosity_filter.verbosity:
+        return
     _logger.debug(msg, extra={"stow_level": level, "indent": indent})
 
 
@@ -141,7 +150,28 @@ def join_paths(*paths: str) -> str:
     This behavior is deliberately different from canon_path() because
     join_paths() is used to calculate relative paths that may not exist yet.
     """
-    debug(5, 5, f"| Joining: {' '.join(paths)}")
+    # join_paths() runs several times per node, so its trace lines are
+    # only formatted when they will actually be printed
+    verbosity = get_debug_level()
+    if verbosity < 5:
+        # Join the raw parts by the rules below: when that is already
+        # normalized, no normpath() call would change it, so it is the
+        # answer. Anything else (".", "..", "//", trailing slashes) fails
+        # the check and takes the full route.
+        result = ""
+        for part in paths:
+            if not part:
+                continue
+            if part.startswith("/"):
+                result = part
+            else:
+                if result and result != "/":
+                    result += "/"
+                result += part
+        if _is_normalized(result):
+            return result
+    else:
+        debug(5, 5, f"| Joining: {' '.join(paths)}")
     result = ""
 
     for part in paths:
@@ -157,23 +187,103 @@ def join_paths(*paths: str) -> str:
                 result += "/"
             result += part
 
-        debug(7, 6, f"| Join now: {result}")
+        if verbosity >= 7:
+            debug(7, 6, f"| Join now: {result}")
 
-    debug(6, 5, f"| Joined: {result}")
+    if verbosity >= 6:
+        debug(6, 5, f"| Joined: {result}")
 
     # normpath() covers both of Perl's steps here (canonpath plus the
     # explicit foo/.. removal loop), so the intermediate debug line shows
     # the same value as the final one.
     result = os.path.normpath(result)
-    debug(6, 5, f"| After .. removal: {result}")
-    debug(5, 5, f"| Final join: {result}")
+    if verbosity >= 5:
+        debug(6, 5, f"| After .. removal: {result}")
+        debug(5, 5, f"| Final join: {result}")
 
     return result
 
 
+def _is_normalized(path: str) -> bool:
+    """Return True if os.path.normpath() would leave path unchanged.
+
+    normpath() is implemented in C on current Pythons, so running it and
+    comparing is cheaper than scanning the components in Python. A POSIX
+    normpath() keeps a leading "//", which the shortcuts built on this
+    must not treat as an empty first component, so such paths report
+    False and take the slow path.
+    """
+    return os.path.normpath(path) == path and not path.startswith("//")
+
+
+def child_path(dir_path: str, name: str) -> str:
+    """Return join_paths(dir_path, name) for a single plain entry name.
+
+    name must be one normalized path component (no slash, not "." or
+    ".."). The result is spelled exactly as join_paths() spells it, so
+    the probed path - and with it the syscall trace - is unchanged; only
+    the normalization work is skipped. Falls back to join_paths() when
+    its -v5 trace would be printed or dir_path itself needs normalizing.
+    """
+    if get_debug_level() >= 5 or not _is_normalized(dir_path):
+        return join_paths(dir_path, name)
+    if dir_path == ".":
+        return name
+    if dir_path == "/":
+        return "/" + name
+    return f"{dir_path}/{name}"
+
+
+def path_prefixes(path: str) -> Iterator[str]:
+    """Yield each leading prefix of path, shortest first.
+
+    Prefixes are spelled as successive join_paths(prefix, part) calls
+    would spell them - empty components skipped, a leading "/" dropped.
+    Unless join_paths()'s -v5 trace is wanted or path needs normalizing,
+    they are sliced straight out of path instead of rebuilt.
+    """
+    if get_debug_level() >= 5 or not _is_normalized(path):
+        prefix = ""
+        for part in path.split("/"):
+            if part:
+                prefix = join_paths(prefix, part)
+                yield prefix
+        return
+    if path == "/":
+        return
+    start = 1 if path.startswith("/") else 0
+    end = path.find("/", start)
+    while end >= 0:
+        yield path[start:end]
+        end = path.find("/", end + 1)
+    yield path[start:]
+
+
+def sorted_names(names: list[str], reverse: bool = False) -> list[str]:
+    """Sort directory entry names by their raw bytes, as Perl's sort does.
+
+    Sorting by os.fsencode keeps a name that is not valid UTF-8 at the
+    same point in the listing as in Perl. An all-ASCII listing orders the
+    same as str and as bytes, so it skips encoding every name.
+    """
+    if all(name.isascii() for name in names):
+        return sorted(names, reverse=reverse)
+    return sorted(names, key=os.fsencode, reverse=reverse)
+
+
+_SLASH_RUN_RE = re.compile(r"/+")
+
+
 def parent(*path_parts: str) -> str:
     """Find the parent of the given path."""
-    path = re.sub(r"/+", "/", "/".join(path_parts)).rstrip("/")
+    path = path_parts[0] if len(path_parts) == 1 else "/".join(path_parts)
+    # Without repeated slashes, everything before the last slash that
+    # is not trailing is the answer (Perl pops the last of the split
+    # elements); only a "//" needs the slash runs collapsed first
+    if "//" not in path:
+        path = path.rstrip("/")
+        return path[: max(path.rfind("/"), 0)]
+    path = _SLASH_RUN_RE.sub("/", path).rstrip("/")
     result = os.path.dirname(path)
     return "" if result == "/" else result
 
@@ -197,7 +307,16 @@ def canon_path(path: str) -> str:
     """
     Find absolute canonical path of given path.
 
-    Uses chdir() to resolve symlinks and relative paths.
+    Uses chdir() to resolve symlinks and relative paths. Deliberately not
+    memoized: the answer depends on the current directory and on symlinks
+    that may change between operations, and the chdir/getcwd pair is part
+    of the syscall trace matched against Perl stow. Each stower calls it
+    once per directory and keeps the derived stow_path.
+
+    Not os.path.realpath() either: that accepts a file or a directory
+    without search permission, both of which chdir() - and so Perl's
+    "cannot chdir" error - rejects. The stower calls it inside its
+    process_lock-held session, like every other cwd change.
     """
     cwd = current_dir()
     try:
@@ -263,16 +382,17 @@ def unadjust_dotfile(target_node: str) -> str:
 
     Used during unstow with --compat and --dotfiles.
     """
+    if not target_node.startswith("."):
+        return target_node
+
     # Perl's guard is /^\.\.?$/, and its "$" (like Python's) also matches
     # just before a final newline, so entries named ".\n" and "..\n" are
-    # left alone too - which decides whether they are unstowed
-    if re.fullmatch(r"\.\.?\n?", target_node):
+    # left alone too - which decides whether they are unstowed. Those four
+    # names are all the pattern can match.
+    if target_node in (".", "..", ".\n", "..\n"):
         return target_node
 
-    if target_node.startswith("."):
-        return "dot-" + target_node[1:]
-
-    return target_node
+    return "dot-" + target_node[1:]
 
 
 def move(src: str, dst: str) -> None:
@@ -30,6 +30,7 @@ import errno
 import os
 import re
 import shutil
+import stat
 import subprocess
 import sys
 
@@ -95,6 +96,10 @@ if not os.path.exists(PERL_STOW):
             PERL_CHKSTOW = None
 
 
+# Looked up once per session; without it only the syscall layer is skipped
+STRACE = shutil.which("strace")
+
+
 # Auto-rebuild bin/ if source files are newer
 BUILD_SCRIPT = os.path.join(EXACT_PYSTOW_DIR, "scripts", "build_single_file.py")
 SRC_DIR = os.path.join(EXACT_PYSTOW_DIR, "src", "stow_python")
@@ -133,6 +138,61 @@ def _apply_env(run_env, env):
             run_env[key] = value
 
 
+def _read_bytes(path, dir_fd=None):
+    """Return the raw contents of a file.
+
+    Reads straight from the descriptor, so none of open()'s buffered-IO
+    layer (and its isatty probe) is set up for each small file.
+    """
+    fd = os.open(path, os.O_RDONLY, dir_fd=dir_fd)
+    try:
+        chunks = []
+        while True:
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                return b"".join(chunks)
+            chunks.append(chunk)
+    finally:
+        os.close(fd)
+
+
+def _write_text(path, content):
+    """Create or truncate a file holding content, encoded as UTF-8.
+
+    The os-level counterpart of open(path, "w").write(content): same
+    0o666-minus-umask mode, without a TextIOWrapper per file.
+    """
+    data = content.encode("utf-8")
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        while data:
+            data = data[os.write(fd, data) :]
+    finally:
+        os.close(fd)
+
+
+def _push_listing(stack, prefix, path, dir_fd):
+    """Open a directory and push (prefix, fd, sorted entries) onto stack.
+
+    prefix is the directory's tmpdir-relative path plus "/" ("" for the
+    top), so entry keys are built by plain concatenation.
+
+    Like os.walk(), a directory that cannot be opened or listed is left
+    out: its parent has recorded it, but it is not descended into.
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY | os.O_NOFOLLOW, dir_fd=dir_fd)
+    except OSError:
+        return
+    try:
+        with os.scandir(fd) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+    except OSError:
+        os.close(fd)
+        return
+    stack.append((prefix, fd, iter(entries)))
+
+
 class StowTestEnv:
     """Test environment for running stow commands."""
 
@@ -153,20 +213,24 @@ class StowTestEnv:
         """
         pkg_dir = os.path.join(self.stow_dir, name)
         makedirs_exist_ok(pkg_dir)
+        # Directories already made in this call, so files sharing a
+        # parent do not each walk the makedirs chain again
+        made = {pkg_dir}
 
         for path, content in files.items():
             full_path = os.path.join(pkg_dir, path)
             parent = os.path.dirname(full_path)
-            if parent:
+            if parent not in made:
                 makedirs_exist_ok(parent)
+                made.add(parent)
 
             if content is None:
                 # Directory
                 makedirs_exist_ok(full_path)
+                made.add(full_path)
             else:
                 # File
-                with open(full_path, "w") as f:
-                    f.write(content)
+                _write_text(full_path, content)
 
     def create_target_file(self, path, content):
         """Create a file in the target directory."""
@@ -174,8 +238,7 @@ class StowTestEnv:
         parent = os.path.dirname(full_path)
         if parent:
             makedirs_exist_ok(parent)
-        with open(full_path, "w") as f:
-            f.write(content)
+        _write_text(full_path, content)
 
     def create_target_dir(self, path):
         """Create a directory in the target directory."""
@@ -205,43 +268,61 @@ class StowTestEnv:
         - ('link', target) for symlinks (perms not checked, usually 0o777)
         """
         state = {}
-        for root, dirs, files in os.walk(self.tmpdir, followlinks=False):
-            rel_root = os.path.relpath(root, self.tmpdir)
-            if rel_root == ".":
-                rel_root = ""
-
-            for d in sorted(dirs):
-                path = os.path.join(rel_root, d) if rel_root else d
-                full_path = os.path.join(root, d)
-                st = os.lstat(full_path)
-                if os.path.islink(full_path):
-                    state[path] = ("link", os.readlink(full_path))
-                else:
-                    state[path] = ("dir", st.st_mode, st.st_uid, st.st_gid)
+        # Walked with scandir over directory fds: link entries are
+        # recognised from the listing instead of an extra islink() per
+        # entry, and every lstat, readlink and open resolves one name
+        # against an open directory rather than the whole path again.
+        # The stack holds one fd per level of the current branch.
+        stack = []
+        _push_listing(stack, "", self.tmpdir, None)
+        try:
+            while stack:
+                prefix, dir_fd, entries = stack[-1]
+                entry = next(entries, None)
+                if entry is None:
+                    stack.pop()
+                    os.close(dir_fd)
+                    continue
 
-            for f in sorted(files):
-                path = os.path.join(rel_root, f) if rel_root else f
-                full_path = os.path.join(root, f)
-                st = os.lstat(full_path)
-                if os.path.islink(full_path):
-                    state[path] = ("link", os.readlink(full_path))
+                path = prefix + entry.name
+                if entry.is_symlink():
+                    state[path] = ("link", os.readlink(entry.name, dir_fd=dir_fd))
+                    continue
+                st = entry.stat(follow_symlinks=False)
+                if stat.S_ISDIR(st.st_mode):
+                    state[path] = ("dir", st.st_mode, st.st_uid, st.st_gid)
+                    _push_listing(stack, path + "/", entry.name, dir_fd)
                 else:
                     # Binary read: byte-exact content comparison; a text-mode
                     # read would conflate \r\n with \n via universal newlines
-                    # and crash on non-UTF-8 content.
-                    with open(full_path, "rb") as fh:
-                        state[path] = (
-                            "file",
-                            fh.read(),
-                            st.st_mode,
-                            st.st_uid,
-                            st.st_gid,
-                        )
+                    # and crash on non-UTF-8 content. An empty regular file
+                    # is not opened at all.
+                    if st.st_size == 0 and stat.S_ISREG(st.st_mode):
+                        content = b""
+                    else:
+                        content = _read_bytes(entry.name, dir_fd)
+                    state[path] = (
+                        "file",
+                        content,
+                        st.st_mode,
+                        st.st_uid,
+                        st.st_gid,
+                    )
+        finally:
+            for _, dir_fd, _ in stack:
+                os.close(dir_fd)
 
         return state
 
     def run_perl_stow(self, args, env=None):
-        """Run Perl stow and return (returncode, stdout, stderr)."""
+        """Run Perl stow and return (returncode, stdout, stderr).
+
+        A fresh interpreter per call is the point of the oracle: bin/stow
+        ends runs with exit() and die(), Stow.pm keeps package-level
+        state between runs, and the exit status, stream interleaving and
+        syscall trace compared here belong to a whole process.  A
+        long-lived worker calling main() would compare something else.
+        """
         if PERL_STOW is None:
             pytest.skip("Perl stow not found")
 
@@ -395,6 +476,16 @@ def normalize_stow_output(text):
     return text
 
 
+_GETOPT_INTEGER_WORDING_RE = re.compile(
+    r'(Value "[^"]*" invalid for option \S+) \(integer number expected\)'
+)
+
+# e.g., "Unsuccessful lstat on filename containing newline at ... line N."
+_NEWLINE_WARNING_RE = re.compile(
+    r"Unsuccessful (?:l?stat) on filename containing newline at [^\n]+ line \d+\.\n"
+)
+
+
 def normalize_getopt_long_wording(text):
     """
     Canonicalize the one Getopt::Long diagnostic whose wording changed
@@ -413,11 +504,7 @@ def normalize_getopt_long_wording(text):
     the full message so it cannot mask a missing or differently-worded
     diagnostic.
     """
-    return re.sub(
-        r'(Value "[^"]*" invalid for option \S+) \(integer number expected\)',
-        r"\1 (number expected)",
-        text,
-    )
+    return _GETOPT_INTEGER_WORDING_RE.sub(r"\1 (number expected)", text)
 
 
 def normalize_newline_warnings(text):
@@ -427,17 +514,7 @@ def normalize_newline_warnings(text):
     These warnings come from stat/lstat internals, not stow logic,
     and trigger in different code paths between Perl and Python.
     """
-    import re
-
-    # Filter warnings about newlines in filenames
-    # e.g., "Unsuccessful lstat on filename containing newline at ... line N."
-    text = re.sub(
-        r"Unsuccessful (?:l?stat) on filename containing newline at [^\n]+ line \d+\.\n",
-        "",
-        text,
-    )
-
-    return text
+    return _NEWLINE_WARNING_RE.sub("", text)
 
 
 def assert_stow_match(stow_env, args, setup_func=None, env=None):
@@ -450,6 +527,17 @@ def assert_stow_match(stow_env, args, setup_func=None, env=None):
     - stderr
     - Filesystem state after execution
 
+    The two runs are deliberately serial, in the same target dir: args
+    and output carry the absolute target path, setup_func is bound to
+    stow_env.target_dir, and both runs share the stow dir (which
+    --adopt writes into), so sibling targets run side by side would
+    neither see the same paths nor stay independent.
+
+    The Python side is a subprocess of the built bin/stow and is
+    snapshotted from disk, like the Perl side, rather than run in-process
+    and rebuilt from its own task list: the comparison is there to catch
+    the shipped script doing something other than it planned.
+
     Args:
         stow_env: StowTestEnv instance
         args: command line arguments
@@ -468,19 +556,28 @@ def assert_stow_match(stow_env, args, setup_func=None, env=None):
     if setup_func:
         setup_func()
     python_rc, python_stdout, python_stderr = stow_env.run_python_stow(args, env)
-    python_state = stow_env.get_filesystem_state()
+
+    # Python output that is byte-identical to Perl's needs no normalizing
+    # of its own: it ends up equal to the normalized Perl side.
+    stderr_identical = python_stderr == perl_stderr
 
     # Normalize Python output to match Perl branding for comparison
-    python_stdout = normalize_stow_output(python_stdout)
-    python_stderr = normalize_stow_output(python_stderr)
+    if python_stdout != perl_stdout:
+        python_stdout = normalize_stow_output(python_stdout)
+    if not stderr_identical:
+        python_stderr = normalize_stow_output(python_stderr)
 
     # Filter out newline warnings from both (these trigger inconsistently)
     perl_stderr = normalize_newline_warnings(perl_stderr)
-    python_stderr = normalize_newline_warnings(python_stderr)
 
     # Absorb the Getopt::Long version difference, not any Stow behavior
     perl_stderr = normalize_getopt_long_wording(perl_stderr)
-    python_stderr = normalize_getopt_long_wording(python_stderr)
+
+    if stderr_identical:
+        python_stderr = perl_stderr
+    else:
+        python_stderr = normalize_newline_warnings(python_stderr)
+        python_stderr = normalize_getopt_long_wording(python_stderr)
 
     # Compare return codes
     assert perl_rc == python_rc, (
@@ -500,7 +597,9 @@ def assert_stow_match(stow_env, args, setup_func=None, env=None):
         python_stderr,
     )
 
-    # Compare filesystem state
+    # Compare filesystem state. The Python tree is only walked once the
+    # cheaper comparisons above have passed; nothing touches it after the run.
+    python_state = stow_env.get_filesystem_state()
     assert perl_state == python_state, (
         "Filesystem state mismatch:\nPerl: %s\nPython: %s" % (perl_state, python_state)
     )
@@ -1067,7 +1166,7 @@ def diff_fs_ops(perl_ops, python_ops):
 def run_with_strace(cmd, cwd, env, strace_output_file):
     """Run a command under strace, capturing filesystem operations."""
     strace_cmd = [
-        "strace",
+        STRACE,
         "-f",
         "-o",
         strace_output_file,
@@ -1111,7 +1210,7 @@ def assert_stow_match_with_fs_ops(stow_env, args, setup_func=None, env=None):
     # happen on dev machines (or OSes) without strace. Even then, the
     # rc/stdout/stderr/tree layers must still run: only the syscall layer
     # itself is skipped, and loudly.
-    if shutil.which("strace") is None:
+    if STRACE is None:
         assert_stow_match(stow_env, args, setup_func=setup_func, env=env)
         pytest.skip(
             "strace not available - rc/stdout/stderr/tree comparison ran; "
@@ -1163,7 +1262,6 @@ def assert_stow_match_with_fs_ops(stow_env, args, setup_func=None, env=None):
     python_rc, python_stdout, python_stderr = run_with_strace(
         python_cmd, stow_env.stow_dir, run_env, python_strace_file
     )
-    python_state = stow_env.get_filesystem_state()
     python_ops = parse_strace_output(python_strace_file, tmpdir=tmpdir)
 
     # Clean up strace files
@@ -1197,7 +1295,9 @@ def assert_stow_match_with_fs_ops(stow_env, args, setup_func=None, env=None):
         f"stderr mismatch:\nPerl: {perl_stderr!r}\nPython: {python_stderr!r}"
     )
 
-    # Compare filesystem state
+    # Compare filesystem state. The Python tree is only walked once the
+    # cheaper comparisons above have passed; nothing touches it after the run.
+    python_state = stow_env.get_filesystem_state()
     assert perl_state == python_state, (
         f"Filesystem state mismatch:\nPerl: {perl_state}\nPython: {python_state}"
     )
@@ -30,7 +30,7 @@ from testutil import init_test_dirs
 
 # Import functions from the package for white-box testing
 from stow_python.cli import parse_cli_options
-from stow_python.stow import _compile_option_pattern
+from stow_python.stow import _compile_anchored_pattern, _compile_option_pattern
 
 
 @pytest.fixture
@@ -176,6 +176,16 @@ class TestIgnoreOption:
         assert lock_regex.search(".#file"), 'ignore[1] should match ".#file"'
         assert lock_regex.search(".#file.lock"), 'ignore[1] should match ".#file.lock"'
 
+    def test_repeated_pattern_compiled_once(self, test_env):
+        """A pattern seen before is served from the shared compile cache."""
+        pattern = "\\.orig-once"
+        _compile_option_pattern(pattern, "ignore")
+        hits = _compile_anchored_pattern.cache_info().hits
+
+        regex = _compile_option_pattern(pattern, "ignore")
+        assert _compile_anchored_pattern.cache_info().hits == hits + 1
+        assert regex.search("file.orig-once")
+
 
 class TestNoHomeExpansion:
     """Test that $HOME is not expanded in paths - corresponds to Perl test 10."""
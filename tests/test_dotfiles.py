@@ -64,6 +64,10 @@ class TestUnadjustDotfile:
             (".", "."),
             ("..", ".."),
             (".file", "dot-file"),
+            # Perl's /^\.\.?$/ also matches before a final newline
+            (".\n", ".\n"),
+            ("..\n", "..\n"),
+            ("...", "dot-.."),
         ],
     )
     def test_unadjust_dotfile(self, input_val, expected):
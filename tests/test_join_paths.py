@@ -19,8 +19,12 @@
 Testing join_paths()
 """
 
+import itertools
+
 import pytest
-from testutil import join_paths
+from testutil import child_path, join_paths, path_prefixes
+
+from stow_python.util import get_debug_level, set_debug_level
 
 
 # Test data: (inputs, expected, scenario)
@@ -60,3 +64,58 @@ def test_join_paths(inputs, expected, scenario):
         expected,
         got,
     )
+
+
+# Paths already normalized (where the shortcuts kick in) and ones that
+# are not (where they must fall back to join_paths)
+SHORTCUT_PATHS = [
+    ".",
+    "/",
+    "",
+    "a",
+    "a/b",
+    "/a/b",
+    "../stow",
+    "../../a/b",
+    "a/../b",
+    "./a",
+    "a//b",
+    "//a",
+    "a/",
+    "a/.",
+    "/..",
+    "..",
+    "0",
+]
+
+
+@pytest.mark.parametrize("dir_path", SHORTCUT_PATHS)
+def test_child_path_matches_join_paths(dir_path):
+    """child_path() is a shortcut and must spell paths like join_paths()."""
+    assert child_path(dir_path, ".stow") == join_paths(dir_path, ".stow")
+
+
+@pytest.mark.parametrize("path", SHORTCUT_PATHS)
+def test_path_prefixes_match_join_paths(path):
+    """path_prefixes() must yield the prefixes a join_paths() loop builds."""
+    expected = []
+    prefix = ""
+    for part in path.split("/"):
+        if part:
+            prefix = join_paths(prefix, part)
+            expected.append(prefix)
+    assert list(path_prefixes(path)) == expected
+
+
+@pytest.mark.parametrize("parts", list(itertools.product(SHORTCUT_PATHS, repeat=2)))
+def test_join_paths_shortcut_matches_full_join(parts):
+    """Below -v5 join_paths() may return the plain join of its parts; it
+    must agree with the full normalization it runs when tracing."""
+    shortcut = join_paths(*parts)
+    level = get_debug_level()
+    set_debug_level(5)
+    try:
+        full = join_paths(*parts)
+    finally:
+        set_debug_level(level)
+    assert shortcut == full
@@ -45,3 +45,19 @@ def test_multiple_slashes():
 def test_empty_parent():
     """empty parent"""
     assert parent("a") == ""
+
+
+def test_root_level_parent():
+    """/a has an empty parent, like a"""
+    assert parent("/a") == ""
+
+
+def test_root():
+    """/ itself"""
+    assert parent("/") == ""
+
+
+def test_several_parts():
+    """parts are joined with / first"""
+    assert parent("a/b", "c/") == "a/b"
+    assert parent("a/", "b") == "a"
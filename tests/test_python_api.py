@@ -22,8 +22,10 @@ These test the library interface as documented in __init__.py,
 not the CLI or internal _Stower class.
 """
 
+import logging
 import os
 import re
+import sys
 
 import pytest
 
@@ -386,6 +388,33 @@ class TestStowResult:
         for task in result.tasks:
             assert isinstance(task, (LinkTask, DirTask, MoveTask))
 
+    @pytest.mark.skipif(
+        sys.getfilesystemencoding() != "utf-8", reason="needs a UTF-8 filesystem"
+    )
+    def test_tasks_follow_byte_order_of_names(self, api_env):
+        """Entries are planned in raw-byte order, like Perl's sort: a name
+        that is not valid UTF-8 (here byte 0xC0) sorts before U+00E9."""
+        names = ["b", "\u00e9", os.fsdecode(b"\xc0")]
+        create_package(api_env["stow_dir"], "pkg", dict.fromkeys(names, "x"))
+
+        result = stow("pkg", dir=api_env["stow_dir"], target=api_env["target_dir"])
+
+        assert [task.path for task in result.tasks] == [
+            "b",
+            os.fsdecode(b"\xc0"),
+            "\u00e9",
+        ]
+
+    def test_task_skipped_flag_is_settable(self, api_env):
+        """Returned task records stay mutable: skipped can be set."""
+        create_package(api_env["stow_dir"], "pkg", {"file": "content"})
+
+        result = stow("pkg", dir=api_env["stow_dir"], target=api_env["target_dir"])
+
+        task = result.tasks[0]
+        task.skipped = True
+        assert task.skipped
+
 
 class TestLibraryRobustness:
     """Pin the library-API hardening: kwargs validation, string patterns,
@@ -430,6 +459,33 @@ class TestLibraryRobustness:
                 ignore=[re.compile("file")],
             )
 
+    @pytest.mark.parametrize(
+        "ignore",
+        [
+            [r"\.bak", r"\.tmp"],
+            [r"\.bak", r"(\.t)mp"],
+            # A backreference or differing flags: not merged, checked one
+            # by one
+            [r"\.bak", r"\.(t)mp|(q)\2"],
+            [r"\.bak", r"(?i)\.TMP"],
+        ],
+    )
+    def test_multiple_patterns_each_apply(self, api_env, ignore):
+        """Several patterns for one option act like the union of them."""
+        create_package(
+            api_env["stow_dir"], "pkg", {"a.bak": "x", "b.tmp": "y", "c.txt": "z"}
+        )
+
+        result = stow(
+            "pkg",
+            dir=api_env["stow_dir"],
+            target=api_env["target_dir"],
+            ignore=ignore,
+        )
+
+        assert result.success
+        assert sorted(os.listdir(api_env["target_dir"])) == ["c.txt"]
+
     def test_malformed_pattern_raises_stow_error(self, api_env):
         """A malformed pattern raises StowError, not re.error."""
         create_package(api_env["stow_dir"], "pkg", {"file": "content"})
@@ -442,6 +498,30 @@ class TestLibraryRobustness:
                 ignore=["foo("],
             )
 
+    def test_quiet_run_builds_no_log_records(self, api_env):
+        """Trace lines above the verbosity are dropped before reaching the
+        "stow" logger, and the ones at or below it still get there."""
+        create_package(api_env["stow_dir"], "pkg", {"dir/file": "content"})
+        records = []
+        handler = logging.Handler()
+        handler.emit = records.append
+        logger = logging.getLogger("stow")
+        logger.addHandler(handler)
+        try:
+            stow("pkg", dir=api_env["stow_dir"], target=api_env["target_dir"])
+            assert records == []
+
+            unstow(
+                "pkg",
+                dir=api_env["stow_dir"],
+                target=api_env["target_dir"],
+                verbose=1,
+            )
+        finally:
+            logger.removeHandler(handler)
+
+        assert [r.getMessage() for r in records] == ["UNLINK: dir"]
+
     def test_ignore_file_cache_is_per_operation(self, tmp_path, monkeypatch):
         """Sequential operations on different trees with the same relative
         layout must each read their own .stow-local-ignore file."""
@@ -32,6 +32,8 @@ from stow_python.util import (
     parent,  # noqa: F401 - re-exported for tests
     canon_path,  # noqa: F401 - re-exported for tests
     join_paths,
+    child_path,  # noqa: F401 - re-exported for tests
+    path_prefixes,  # noqa: F401 - re-exported for tests
     adjust_dotfile,
     unadjust_dotfile,
 )